@@ -3,10 +3,22 @@
 #!/usr/bin/env python3
 
 import argparse
-import base64
+import atexit
+import binascii
+import contextlib
+import functools
+import http.client
 import json
+import os
+import re
 import subprocess
+import tempfile
+import threading
+import time
 import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlsplit
 
 from rich.console import Console
 from rich.panel import Panel
@@ -18,22 +30,624 @@ from rich.table import Table
 # Initialize rich console
 console = Console()
 
+# Print raw response dumps while extracting content; set by --debug
+DEBUG = False
+
+# Reuse tool, tree and file results within and between runs; turned off by --no-cache
+USE_CACHE = True
+
+# Seconds a result kept from an earlier run is reused without checking it again
+CACHE_TTL = 3600.0
+
+# Command that runs the MCP server over stdio; MCP_CONTAINER picks the container
+_MCP_ARGV = (
+    "docker",
+    "exec",
+    "-i",
+    os.environ.get("MCP_CONTAINER", "github-mcp-server"),
+    "./github-mcp-server",
+    "stdio",
+)
+
+# Seconds to wait for the reply to a request before giving up on it
+_REPLY_TIMEOUT = 60
+
+# Matches the base64 payload in a text field like {"content":"BASE64DATA"}
+_CONTENT_RE = re.compile(r'"content"\s*:\s*"([^"]+)"')
+
+# Words suggesting a file documents an API, matched anywhere in the text (so
+# "APIs", "API_KEY" and "functionality" count); one case-insensitive scan that
+# stops at the first match
+_API_KEYWORDS_RE = re.compile(
+    r"api|function|method|class|parameter|usage|example", re.IGNORECASE
+)
+# Only the start of a file is scanned; documentation says what it covers early
+_API_KEYWORDS_SCAN_CHARS = 16384
+
+
+def _decode_base64(data):
+    """Decode base64 file content from the GitHub API into text.
+
+    ``binascii.a2b_base64`` skips the line breaks GitHub inserts every 60
+    characters while it decodes, so there is no need to strip them first and
+    make a second copy of a large payload.
+    """
+    return binascii.a2b_base64(data).decode("utf-8")
+
 
 def header(text):
     """Display a header with nice formatting."""
     console.print(Panel(f"[bold blue]{text}[/]", border_style="blue"))
 
 
-def run_mcp_command(method, params=None, show_request=True, show_raw_response=False):
-    """Run command directly against the MCP server via stdio."""
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _iter_json_values(text):
+    """Yield each JSON value in text with its start and end offsets.
+
+    Values are decoded in place with ``raw_decode`` rather than by splitting
+    the text first, and anything after the last complete value (such as a
+    stray log fragment) is ignored.
+    """
+    idx = 0
+    while True:
+        while idx < len(text) and text[idx] in " \n\r\t":
+            idx += 1
+        if idx == len(text):
+            return
+        try:
+            value, end = _JSON_DECODER.raw_decode(text, idx)
+        except json.JSONDecodeError:
+            return
+        yield value, idx, end
+        idx = end
+
+
+class MCPSessionError(Exception):
+    """Raised when the MCP server process exits or cannot be reached."""
+
+
+class MCPSession:
+    """Long-running stdio connection to the MCP server inside the container.
+
+    The server process is started on the first request and reused for every
+    call after that, so the ``docker exec`` spawn is paid once per run rather
+    than once per request. A reader thread hands each reply to the future
+    waiting on its id, so requests can be submitted without blocking and any
+    number of them can be in flight at once.
+    """
+
+    def __init__(self, argv):
+        self.argv = argv
+        self.proc = None
+        self.raw_previews = {}
+        self._waiting = {}
+        self._reader = None
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    def connect(self):
+        """Start the MCP server process if it is not already running."""
+        if self.proc is None or self.proc.poll() is not None:
+            # Server logs go to a temporary file so a chatty stderr can never
+            # fill its pipe and block the process while we wait on stdout.
+            # The reader thread closes it once the process has exited.
+            stderr = tempfile.TemporaryFile()  # noqa: SIM115
+            self.proc = subprocess.Popen(
+                self.argv,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=stderr,
+            )
+            # Each process gets its own table of waiting futures and its own
+            # stderr file, so a reader that is shutting down can only fail
+            # requests sent to its process and only report its own logs.
+            self._waiting = {}
+            self._reader = threading.Thread(
+                target=self._read_replies,
+                args=(self.proc, self._waiting, stderr),
+                daemon=True,
+            )
+            self._reader.start()
+        return self.proc
+
+    def disconnect(self):
+        """Close the server's stdin and wait for it to exit."""
+        if self.proc is None:
+            return
+        try:
+            if self.proc.stdin:
+                self.proc.stdin.close()
+        except BrokenPipeError:
+            pass  # The server already exited
+        try:
+            self.proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+        self._reader.join(timeout=5)
+        self.proc = None
+
+    def submit_many(self, requests):
+        """Send several requests in one write and return their futures by id.
+
+        All requests are written in a single ``write()`` without waiting for
+        any reply, so the server works through them back to back and the batch
+        costs one round trip instead of one per request.
+        """
+        futures = {r["id"]: Future() for r in requests}
+        with self._lock:
+            proc = self.connect()
+            self._waiting.update(futures)
+
+        # Writes take a separate lock so a full stdin pipe can never hold up
+        # the reader thread, which needs self._lock to hand out replies
+        with self._write_lock:
+            try:
+                proc.stdin.write(
+                    "".join(json.dumps(r) + "\n" for r in requests).encode("utf-8")
+                )
+                proc.stdin.flush()
+            except BrokenPipeError:
+                pass  # The server exited; the reader fails the futures
+        return futures
+
+    def submit(self, request):
+        """Send a JSON-RPC request and return a future for its response."""
+        return self.submit_many([request])[request["id"]]
+
+    def discard(self, request_id):
+        """Stop waiting for a reply, so one that arrives late is dropped."""
+        with self._lock:
+            self._waiting.pop(request_id, None)
+        self.raw_previews.pop(request_id, None)
+
+    def _read_replies(self, proc, waiting, stderr):
+        """Resolve the future waiting on each reply until the server exits."""
+        # Pipes are binary so each line is decoded in one call rather than
+        # incrementally by a text wrapper as it is read
+        for raw_line in proc.stdout:
+            line = raw_line.decode("utf-8", errors="replace")
+            for response, start, end in _iter_json_values(line):
+                if not isinstance(response, dict) or "id" not in response:
+                    continue  # Notifications carry no id
+
+                with self._lock:
+                    future = waiting.pop(response["id"], None)
+                if future is None:
+                    continue
+
+                self.raw_previews[response["id"]] = line[
+                    start : min(end, start + 500)
+                ] + ("..." if end - start > 500 else "")
+                future.set_result(response)
+
+        return_code = proc.wait()
+        with stderr:
+            stderr.seek(0)
+            logs = stderr.read().decode("utf-8", errors="replace").strip()
+        error = MCPSessionError(
+            f"MCP server exited with return code {return_code}: {logs}"
+        )
+        with self._lock:
+            unanswered = list(waiting.values())
+            waiting.clear()
+        for future in unanswered:
+            future.set_exception(error)
+
+
+class MCPHttpSession:
+    """Connection to an MCP server running in HTTP mode.
+
+    Requests are posted over one keep-alive connection, so each call is a
+    write and a read on an open socket with no process spawned. The methods
+    match MCPSession, and requests are sent in order from a single worker
+    thread that owns the connection. Requests submitted together are posted
+    as one JSON-RPC batch, so they share a round trip instead of queueing one
+    behind another.
+    """
+
+    def __init__(self, url, token=None):
+        self.url = urlsplit(url)
+        self.token = token
+        self.raw_previews = {}
+        self._conn = None
+        self._session_id = None
+        self._batching = True
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    def connect(self):
+        """Open the HTTP connection and run the MCP initialize handshake."""
+        if self._conn is not None:
+            return self._conn
+
+        conn_class = (
+            http.client.HTTPSConnection
+            if self.url.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        self._conn = conn_class(self.url.netloc, timeout=60)
+        self._session_id = None
+
+        # Streamable HTTP servers hand out their session id on initialize
+        try:
+            self._post(
+                build_request(
+                    "initialize",
+                    {
+                        "protocolVersion": "2025-03-26",
+                        "capabilities": {},
+                        "clientInfo": {
+                            "name": "github-mcp-example",
+                            "version": "0.1.0",
+                        },
+                    },
+                )
+            )
+            self._post({"jsonrpc": "2.0", "method": "notifications/initialized"})
+        except Exception:
+            # Keep no half-initialized session, so the next call shakes hands again
+            self._conn.close()
+            self._conn = None
+            raise
+        return self._conn
+
+    def disconnect(self):
+        """Close the HTTP connection."""
+        self._executor.shutdown(wait=True)
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def submit_many(self, requests):
+        """Queue several requests as one batch and return their futures by id."""
+        if len(requests) < 2:
+            return {r["id"]: self._executor.submit(self._send, r) for r in requests}
+
+        futures = {r["id"]: Future() for r in requests}
+        self._executor.submit(self._send_batch, requests, futures)
+        return futures
+
+    def submit(self, request):
+        """Queue a JSON-RPC request and return a future for its response."""
+        return self.submit_many([request])[request["id"]]
+
+    def discard(self, request_id):
+        """Drop anything kept for a request that is no longer waited on."""
+        self.raw_previews.pop(request_id, None)
+
+    def _send_batch(self, requests, futures):
+        """Post requests as one batch on the worker thread and resolve futures.
+
+        A server that rejects batches, or leaves some requests unanswered, is
+        sent the missing requests one at a time, and no further batches.
+        """
+        responses = {}
+        if self._batching:
+            try:
+                responses = self._send(requests)
+            except Exception as e:
+                # A failed handshake leaves no connection behind and says
+                # nothing about batches; any other MCPSessionError is the
+                # server rejecting the batch, and the requests go one by one
+                if self._conn is None or not isinstance(e, MCPSessionError):
+                    # Nothing else resolves these futures, so fail them all
+                    for future in futures.values():
+                        future.set_exception(e)
+                    return
+            if len(responses) < len(requests):
+                self._batching = False
+
+        for request in requests:
+            future = futures[request["id"]]
+            try:
+                response = responses.get(request["id"]) or self._send(request)
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                future.set_result(response)
+
+    def _send(self, request):
+        """Post a request or batch on the worker thread, reconnecting once if needed."""
+        try:
+            self.connect()
+            return self._post(request)
+        except (OSError, http.client.HTTPException):
+            # The server may have closed an idle keep-alive connection
+            self._conn = None
+        try:
+            self.connect()
+            return self._post(request)
+        except (OSError, http.client.HTTPException) as e:
+            self._conn = None
+            raise MCPSessionError(f"HTTP request to MCP server failed: {e}") from e
+
+    def _post(self, message):
+        """Post a JSON-RPC message and return the reply with the same id.
+
+        A list of requests is posted as a batch, and the replies are returned
+        in a dict keyed by id.
+        """
+        headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json, text/event-stream",
+        }
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        if self._session_id:
+            headers["Mcp-Session-Id"] = self._session_id
+
+        self._conn.request(
+            "POST", self.url.path or "/", body=json.dumps(message), headers=headers
+        )
+        reply = self._conn.getresponse()
+        body = reply.read().decode("utf-8", errors="replace")
+        self._session_id = reply.getheader("Mcp-Session-Id", self._session_id)
+
+        if reply.status >= 400:
+            raise MCPSessionError(f"MCP server returned HTTP {reply.status}: {body}")
+        if isinstance(message, dict) and "id" not in message:
+            return None  # Notifications get an empty 202 reply
+
+        # The reply is either plain JSON or a stream of server-sent events
+        if reply.getheader("Content-Type", "").startswith("text/event-stream"):
+            body = "\n".join(
+                line[5:].strip()
+                for line in body.splitlines()
+                if line.startswith("data:")
+            )
+        batch = isinstance(message, list)
+        wanted = {m["id"] for m in message} if batch else {message["id"]}
+        responses = self._collect_replies(body, wanted)
+
+        if batch:
+            if not responses:
+                raise MCPSessionError("MCP server did not answer the batch request")
+            return responses
+        if message["id"] not in responses:
+            raise MCPSessionError(
+                f"No reply to request {message['id']} from MCP server"
+            )
+        return responses[message["id"]]
+
+    def _collect_replies(self, body, wanted):
+        """Return the replies in a response body whose ids are wanted, by id."""
+        responses = {}
+        for value, start, end in _iter_json_values(body):
+            # A batch reply is one JSON array, or one event per reply if streamed
+            for response in value if isinstance(value, list) else [value]:
+                if not isinstance(response, dict) or response.get("id") not in wanted:
+                    continue
+                if response is value:
+                    preview = body[start : min(end, start + 500)] + (
+                        "..." if end - start > 500 else ""
+                    )
+                else:
+                    raw = json.dumps(response)
+                    preview = raw[:500] + ("..." if len(raw) > 500 else "")
+                self.raw_previews[response["id"]] = preview
+                responses[response["id"]] = response
+        return responses
+
+
+# Shared session used by every demo; closed when the interpreter exits. Set
+# GITHUB_MCP_HTTP_URL to use a server running in HTTP mode instead of docker exec.
+if os.environ.get("GITHUB_MCP_HTTP_URL"):
+    MCP_SESSION = MCPHttpSession(
+        os.environ["GITHUB_MCP_HTTP_URL"],
+        token=os.environ.get("GITHUB_PERSONAL_ACCESS_TOKEN"),
+    )
+else:
+    MCP_SESSION = MCPSession(_MCP_ARGV)
+atexit.register(MCP_SESSION.disconnect)
+
+# Requests sent ahead of time by prefetch_mcp_commands and the futures for
+# their replies, keyed by method and params
+_PREFETCHED = {}
+
+# Tool catalog from the first successful tools/list; it does not change in a run
+_TOOLS_CACHE = None
+
+# File listings from get_repo_tree, keyed by (owner, repo)
+_REPO_TREES = {}
+
+# Replies from get_specific_file, keyed by (owner, repo, path)
+_FILE_CACHE = {}
+
+# Directory for results kept between runs
+_CACHE_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "gh_mcp_demo"
+)
+
+# Seconds an entry with a blob SHA is kept for; it stays usable past CACHE_TTL
+# because a repository listing can still confirm it is unchanged
+_STORED_MAX_AGE = 7 * 24 * 3600
+
+
+class StoredReplies:
+    """Results kept on disk between runs, checked by blob SHA or by age.
+
+    The MCP tools do not expose HTTP headers, so there is no ETag to send with
+    If-None-Match. The blob SHA plays the same part for files: when a
+    repository listing shows a file still has the SHA it had when it was
+    stored, the stored reply is used and the file is not downloaded again.
+    Without a SHA to compare, an entry is used while it is younger than
+    ``CACHE_TTL`` seconds. Entries that can no longer be used are dropped when
+    the file is saved; those with a SHA are kept for ``_STORED_MAX_AGE``.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._entries = None
+        self._changed = False
+
+    def get(self, key, sha=None):
+        """Return the stored value for key if it has this SHA or is still fresh."""
+        entry = self._load().get(key)
+        if not entry:
+            return None
+        if sha is not None:
+            return entry["value"] if entry.get("sha") == sha else None
+        if time.time() - entry.get("stored_at", 0) < CACHE_TTL:
+            return entry["value"]
+        return None
+
+    def put(self, key, value, sha=None):
+        """Store a value, along with its blob SHA if it has one."""
+        self._load()[key] = {"sha": sha, "stored_at": time.time(), "value": value}
+        self._changed = True
+
+    def save(self):
+        """Drop expired entries and write the others to disk if anything changed."""
+        if self._entries is not None:
+            now = time.time()
+            expired = [
+                key
+                for key, entry in self._entries.items()
+                if now - entry.get("stored_at", 0)
+                >= (_STORED_MAX_AGE if entry.get("sha") else CACHE_TTL)
+            ]
+            for key in expired:
+                del self._entries[key]
+            self._changed = self._changed or bool(expired)
+        if not self._changed:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(self._entries), encoding="utf-8")
+            tmp_path.replace(self.path)
+            self._changed = False
+        except OSError as e:
+            console.print(f"[dim]Could not save result cache: {e}[/]")
+
+    def _load(self):
+        """Read the stored results on first use."""
+        if self._entries is None:
+            try:
+                self._entries = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError):
+                self._entries = {}
+        return self._entries
+
+
+STORED_REPLIES = StoredReplies(_CACHE_DIR / "replies.json")
+atexit.register(STORED_REPLIES.save)
+
+# Where read_api_docs looks for documentation, in priority order, and where it
+# looks instead when the repository has no docs directory
+_DOC_PATHS = (
+    "docs/api.md",
+    "docs/API.md",
+    "docs/api/README.md",
+    "docs/index.md",
+    "docs/api/index.md",
+    "docs/README.md",
+    "docs/usage.md",
+    "API.md",
+    "api.md",
+)
+_ROOT_DOC_PATHS = ("API.md", "api.md", "USAGE.md", "usage.md", "README.md")
+
+# Files read_api_docs falls back to: examples when the docs found do not look
+# like API docs, source files when no docs were found at all
+_EXAMPLE_PATHS = ("examples/example.py", "example.py", "examples/demo.py", "demo.py")
+_SOURCE_PATHS = ("src/main.py", "src/__init__.py", "cyclops/__init__.py", "main.py")
+
+# Most file probes sent at once, to stay clear of GitHub's secondary rate limit
+_MAX_PROBES_IN_FLIGHT = 8
+
+
+def build_request(method, params=None):
+    """Build a JSON-RPC request with a fresh id."""
     request = {"jsonrpc": "2.0", "id": str(uuid.uuid4()), "method": method}
 
     if params:
         request["params"] = params
 
-    # Create command to pipe JSON to the container's stdin
-    request_json = json.dumps(request)
-    cmd = f"echo '{request_json}' | docker exec -i github-mcp-server ./github-mcp-server stdio"
+    return request
+
+
+def _request_key(method, params):
+    """Return a hashable key identifying a request by its method and params."""
+    return json.dumps([method, params], sort_keys=True)
+
+
+def search_repos_params(query, per_page):
+    """Build the tools/call params for a search_repositories request."""
+    return {
+        "name": "search_repositories",
+        "arguments": {"query": query, "perPage": per_page},
+    }
+
+
+def file_contents_params(owner, repo, path):
+    """Build the tools/call params for a get_file_contents request."""
+    return {
+        "name": "get_file_contents",
+        "arguments": {"owner": owner, "repo": repo, "path": path},
+    }
+
+
+def repo_tree_params(owner, repo):
+    """Build the tools/call params for a recursive get_repository_tree request."""
+    return {
+        "name": "get_repository_tree",
+        "arguments": {"owner": owner, "repo": repo, "recursive": True},
+    }
+
+
+def prefetch_mcp_commands(calls):
+    """Send a batch of (method, params) calls in one pipelined write.
+
+    This returns as soon as the batch is written. When run_mcp_command is later
+    asked for the same method and params it waits on the reply that is already
+    in flight instead of making a new request, so replies keep arriving while
+    earlier demos are still rendering their output.
+    """
+    requests = {}
+    for method, params in calls:
+        key = _request_key(method, params)
+        if key in _PREFETCHED:
+            continue  # already in flight
+        request = build_request(method, params)
+        requests[request["id"]] = (key, request)
+    if not requests:
+        return
+
+    try:
+        futures = MCP_SESSION.submit_many([r for _, r in requests.values()])
+    except OSError:
+        return  # run_mcp_command reports the failure when the call is made
+
+    for request_id, (key, request) in requests.items():
+        _PREFETCHED[key] = (request, futures[request_id])
+
+
+def _request_spinner():
+    """Return a spinner to show while a request runs.
+
+    When output is piped or run in CI the spinner would never be seen, so a
+    no-op context is returned instead of starting a live render thread.
+    """
+    if not console.is_terminal:
+        return contextlib.nullcontext()
+
+    progress = Progress(
+        SpinnerColumn(),
+        TextColumn("[bold green]Executing request..."),
+        transient=True,
+    )
+    progress.add_task("", total=None)
+    return progress
+
+
+def run_mcp_command(method, params=None, show_request=True, show_raw_response=False):
+    """Run command directly against the MCP server via stdio."""
+    request, future = _PREFETCHED.pop(_request_key(method, params), (None, None))
+    if request is None:
+        request = build_request(method, params)
 
     if show_request:
         console.print("[bold cyan]Request:[/]")
@@ -42,47 +656,36 @@ def run_mcp_command(method, params=None, show_request=True, show_raw_response=Fa
         )
         console.print(syntax)
 
-    # Execute the command with a spinner
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[bold green]Executing request..."),
-        transient=True,
-    ) as progress:
-        progress.add_task("", total=None)
-        result = subprocess.run(
-            cmd, shell=True, capture_output=True, text=True, check=False
-        )
+    # Send the request over the shared session with a spinner
+    response = None
+    with _request_spinner():
+        try:
+            if future is None:
+                future = MCP_SESSION.submit(request)
+            response = future.result(timeout=_REPLY_TIMEOUT)
+        except TimeoutError:
+            MCP_SESSION.discard(request["id"])
+            error = f"No reply to request {request['id']} after {_REPLY_TIMEOUT}s"
+        except (OSError, MCPSessionError) as e:
+            error = e
+
+    if response is None:
+        console.print("[bold red]Command failed[/]")
+        console.print(f"[red]Error:[/] {error}")
+        return None
 
-    if result.returncode == 0:
-        # Parse the JSON response
-        output = result.stdout.strip()
+    preview = MCP_SESSION.raw_previews.pop(request["id"], "")
+    if show_raw_response:
+        console.print("[bold yellow]Raw Response (truncated):[/]")
+        console.print(preview)
 
-        if show_raw_response:
-            console.print("[bold yellow]Raw Response (truncated):[/]")
-            truncated = output[:500] + "..." if len(output) > 500 else output
-            console.print(truncated)
+    return [response]
 
-        try:
-            # The response may have multiple JSON objects, each on its own line
-            responses = []
-            for line in output.split("\n"):
-                if line.strip():
-                    try:
-                        responses.append(json.loads(line.strip()))
-                    except json.JSONDecodeError:
-                        if show_raw_response:
-                            console.print("[red]Failed to parse line[/]")
 
-            return responses
-        except Exception as e:
-            console.print(f"[bold red]Error parsing response:[/] {str(e)}")
-            return None
-    else:
-        console.print(
-            f"[bold red]Command failed with return code {result.returncode}[/]"
-        )
-        console.print(f"[red]Error:[/] {result.stderr}")
-        return None
+# Keyword to display group for the tools table: repository tools, then file
+# tools, then everything else
+_TOOL_BUCKETS = {"repo": 0, "pull": 0, "issue": 0, "file": 1, "content": 1}
+_OTHER_TOOLS_BUCKET = 2
 
 
 def display_tools(tools, max_tools=30):
@@ -93,26 +696,20 @@ def display_tools(tools, max_tools=30):
     table.add_column("Tool", style="cyan")
     table.add_column("Description")
 
-    # Categorize and sort tools
-    repo_tools = []
-    file_tools = []
-    other_tools = []
-
+    # Categorize tools in one pass; the first matching keyword wins, so a name
+    # like "get_repo_file" counts as a repository tool
+    buckets = [[] for _ in range(_OTHER_TOOLS_BUCKET + 1)]
     for tool in tools:
         name = tool["name"].lower()
-        if "repo" in name or "pull" in name or "issue" in name:
-            repo_tools.append(tool)
-        elif "file" in name or "content" in name:
-            file_tools.append(tool)
-        else:
-            other_tools.append(tool)
+        bucket = next(
+            (b for k, b in _TOOL_BUCKETS.items() if k in name), _OTHER_TOOLS_BUCKET
+        )
+        buckets[bucket].append(tool)
 
     # Add most relevant tools first
-    display_tools = (
-        sorted(repo_tools, key=lambda x: x["name"])
-        + sorted(file_tools, key=lambda x: x["name"])
-        + sorted(other_tools, key=lambda x: x["name"])
-    )
+    display_tools = [
+        tool for bucket in buckets for tool in sorted(bucket, key=lambda x: x["name"])
+    ]
 
     # Add tools to the table (limited to max_tools)
     for tool in display_tools[:max_tools]:
@@ -140,14 +737,17 @@ def display_repo(repo, index=1):
     console.print(panel)
 
 
+def _looks_like_repo_list(items):
+    """Return True if a non-empty list starts with a repository object."""
+    return len(items) > 0 and isinstance(items[0], dict) and "full_name" in items[0]
+
+
 def extract_repos_from_response(response_data):
     """Extract repository data from complex JSON response structure."""
     # Check different response formats
     if isinstance(response_data, list):
-        # Check if each item looks like a repository
-        if all(
-            isinstance(item, dict) and "full_name" in item for item in response_data[:3]
-        ):
+        # Check if the list looks like a list of repositories
+        if _looks_like_repo_list(response_data):
             return response_data
 
     elif isinstance(response_data, dict):
@@ -179,12 +779,8 @@ def extract_repos_from_response(response_data):
                                 return data["repositories"]
                             if "data" in data and isinstance(data["data"], list):
                                 return data["data"]
-                        elif isinstance(data, list):
-                            if all(
-                                isinstance(repo, dict) and "full_name" in repo
-                                for repo in data[:3]
-                            ):
-                                return data
+                        elif isinstance(data, list) and _looks_like_repo_list(data):
+                            return data
                     except:
                         pass
 
@@ -198,6 +794,11 @@ def extract_repos_from_response(response_data):
 
 def get_tools_list(show_request=False):
     """Get list of available tools from the MCP server."""
+    global _TOOLS_CACHE  # noqa: PLW0603
+    tools_list = _stored_tools()
+    if tools_list is not None:
+        return tools_list
+
     tools_result = run_mcp_command("tools/list", show_request=show_request)
 
     if not tools_result:
@@ -211,7 +812,20 @@ def get_tools_list(show_request=False):
         console.print("[bold red]Invalid tools list response.[/]")
         return None
 
-    return valid_result["result"]["tools"]
+    _TOOLS_CACHE = valid_result["result"]["tools"]
+    if USE_CACHE:
+        STORED_REPLIES.put("tools", _TOOLS_CACHE)
+    return _TOOLS_CACHE
+
+
+def _stored_tools():
+    """Return the tool catalog kept from this run or a recent one, or None."""
+    global _TOOLS_CACHE  # noqa: PLW0603
+    if not USE_CACHE:
+        return None
+    if _TOOLS_CACHE is None:
+        _TOOLS_CACHE = STORED_REPLIES.get("tools")
+    return _TOOLS_CACHE
 
 
 def display_available_tools():
@@ -248,10 +862,7 @@ def search_popular_repos():
 
     search_result = run_mcp_command(
         "tools/call",
-        {
-            "name": "search_repositories",
-            "arguments": {"query": "stars:>10000", "perPage": 3},
-        },
+        search_repos_params("stars:>10000", 3),
         show_raw_response=True,
     )
 
@@ -298,14 +909,16 @@ def get_readme_content():
     # Get README content
     console.print("\n[bold]Fetching README from a popular repository...[/]")
 
-    file_result = run_mcp_command(
-        "tools/call",
-        {
-            "name": "get_file_contents",
-            "arguments": {"owner": "facebook", "repo": "react", "path": "README.md"},
-        },
-        show_raw_response=True,
-    )
+    file_result = _cached_file_result("facebook", "react", "README.md")
+    if file_result is not None:
+        console.print("[dim]Using cached README.md from facebook/react[/]")
+    else:
+        file_result = run_mcp_command(
+            "tools/call",
+            file_contents_params("facebook", "react", "README.md"),
+            show_raw_response=True,
+        )
+        _remember_file("facebook", "react", "README.md", file_result)
 
     # Extract and display README content
     if file_result:
@@ -313,133 +926,7 @@ def get_readme_content():
 
         if valid_file and "result" in valid_file:
             result = valid_file["result"]
-            decoded_content = None
-
-            # Using a direct approach first: extract the content directly using regex
-            if (
-                isinstance(result, dict)
-                and "content" in result
-                and isinstance(result["content"], list)
-            ):
-                for item in result["content"]:
-                    if isinstance(item, dict) and "text" in item:
-                        try:
-                            raw_text = item["text"]
-
-                            # Try to extract pattern from text: {"content":"BASE64DATA"}
-                            import re
-
-                            content_match = re.search(
-                                r'"content"\s*:\s*"([^"]+)"', raw_text
-                            )
-
-                            if content_match:
-                                base64_data = content_match.group(1)
-                                # Replace escaped newlines
-                                base64_data = base64_data.replace("\\n", "")
-                                try:
-                                    # Try to decode base64 content
-                                    decoded_content = base64.b64decode(
-                                        base64_data
-                                    ).decode("utf-8")
-                                    console.print(
-                                        "[dim]Successfully extracted README content using regex[/]"
-                                    )
-                                    break
-                                except Exception as e:
-                                    console.print(
-                                        f"[dim]Base64 decode error: {str(e)[:100]}[/]"
-                                    )
-                        except Exception as e:
-                            console.print(
-                                f"[dim]Regex extraction error: {str(e)[:100]}[/]"
-                            )
-
-            # If regex approach failed, try the previous approaches
-            if not decoded_content:
-                console.print(
-                    "[dim]Regex approach failed for README, trying JSON parsing methods...[/]"
-                )
-
-                # Format 1: Direct content in result
-                if isinstance(result, dict) and "content" in result:
-                    try:
-                        if isinstance(result["content"], str):
-                            # Try to decode base64 content
-                            decoded_content = base64.b64decode(
-                                result["content"]
-                            ).decode("utf-8")
-                    except Exception as e:
-                        console.print(f"[dim]Format 1 extraction failed: {e}[/]")
-
-                # Format 2: Result is a list of content items with text field
-                elif isinstance(result, list) and len(result) > 0:
-                    for item in result:
-                        if isinstance(item, dict) and "text" in item:
-                            try:
-                                text = (
-                                    item["text"]
-                                    .replace("\n", "")
-                                    .replace("\\n", "")
-                                    .strip()
-                                )
-                                content_json = json.loads(text)
-
-                                if (
-                                    isinstance(content_json, dict)
-                                    and "content" in content_json
-                                ):
-                                    # Try to decode the base64 content
-                                    decoded_content = base64.b64decode(
-                                        content_json["content"]
-                                    ).decode("utf-8")
-                                    break
-                            except Exception as e:
-                                console.print(
-                                    f"[dim]README parsing error: {str(e)[:100]}[/]"
-                                )
-
-                # Format 3: Content array in result
-                elif (
-                    isinstance(result, dict)
-                    and "content" in result
-                    and isinstance(result["content"], list)
-                ):
-                    for item in result["content"]:
-                        if isinstance(item, dict) and "text" in item:
-                            try:
-                                # Try to parse the text field
-                                text = (
-                                    item["text"]
-                                    .replace("\n", "")
-                                    .replace("\\n", "")
-                                    .strip()
-                                )
-                                content_json = json.loads(text)
-
-                                if (
-                                    isinstance(content_json, dict)
-                                    and "content" in content_json
-                                ):
-                                    # Try to decode the base64 content
-                                    decoded_content = base64.b64decode(
-                                        content_json["content"]
-                                    ).decode("utf-8")
-                                    break
-                                if isinstance(content_json, str):
-                                    # Maybe the content is directly in text
-                                    decoded_content = content_json
-                                    break
-                            except Exception as e:
-                                console.print(
-                                    f"[dim]README format 3 parsing error: {str(e)[:100]}[/]"
-                                )
-                                # Maybe the text is directly the content
-                                if "text" in item and isinstance(item["text"], str):
-                                    # Check if it looks like markdown
-                                    if "# " in item["text"] or "## " in item["text"]:
-                                        decoded_content = item["text"]
-                                        break
+            decoded_content = _decode_file_payload(result)
 
             # Display the content if found
             if decoded_content:
@@ -457,8 +944,9 @@ def get_readme_content():
                 console.print(
                     "[bold yellow]Could not extract README content from response[/]"
                 )
-                console.print("[dim]Response structure (truncated):[/]")
-                console.print(json.dumps(result, indent=2)[:300] + "...")
+                if DEBUG:
+                    console.print("[dim]Response structure (truncated):[/]")
+                    console.print(json.dumps(result, indent=2)[:300] + "...")
         else:
             console.print("[bold red]Invalid file result response[/]")
     else:
@@ -492,13 +980,8 @@ def list_org_repos():
     # Search for repositories in the organization
     repos_result = run_mcp_command(
         "tools/call",
-        {
-            "name": "search_repositories",
-            "arguments": {
-                "query": f"org:{org_name}",
-                "perPage": 5,  # Show more repos from the organization
-            },
-        },
+        # Show more repos from the organization
+        search_repos_params(f"org:{org_name}", 5),
         show_raw_response=True,
     )
 
@@ -524,10 +1007,7 @@ def list_org_repos():
 
                 alt_repos_result = run_mcp_command(
                     "tools/call",
-                    {
-                        "name": "search_repositories",
-                        "arguments": {"query": f"user:{org_name}", "perPage": 5},
-                    },
+                    search_repos_params(f"user:{org_name}", 5),
                     show_raw_response=False,
                 )
 
@@ -558,9 +1038,19 @@ def list_org_repos():
 
 
 def get_specific_file(owner, repo, file_path):
-    """Fetch a specific file from a repository and print its contents."""
+    """Fetch a specific file from a repository and print its contents.
+
+    Replies are kept for the rest of the run, including "not found" errors, so
+    asking for the same path again costs no round trip. Failed requests are not
+    kept.
+    """
     header(f"Fetching {file_path} from {owner}/{repo}")
 
+    cached_result = _cached_file_result(owner, repo, file_path)
+    if cached_result is not None:
+        console.print(f"[dim]Using cached {file_path} from {owner}/{repo}[/]")
+        return cached_result
+
     # Find the file contents tool
     tools_list = get_tools_list(show_request=False)
 
@@ -575,14 +1065,299 @@ def get_specific_file(owner, repo, file_path):
 
     console.print(f"\n[bold]Fetching {file_path} from {owner}/{repo}...[/]")
 
-    return run_mcp_command(
+    file_result = run_mcp_command(
         "tools/call",
-        {
-            "name": "get_file_contents",
-            "arguments": {"owner": owner, "repo": repo, "path": file_path},
-        },
+        file_contents_params(owner, repo, file_path),
         show_raw_response=True,
     )
+    _remember_file(owner, repo, file_path, file_result)
+    return file_result
+
+
+def _remember_file(owner, repo, file_path, file_result):
+    """Keep a get_file_contents reply for this run and, if it has a SHA, later ones."""
+    if file_result is None or not USE_CACHE:
+        return
+    _FILE_CACHE[(owner, repo, file_path)] = file_result
+    sha = _file_sha(file_result)
+    if sha:
+        STORED_REPLIES.put(_stored_file_key(owner, repo, file_path), file_result, sha)
+
+
+def _stored_file_key(owner, repo, file_path):
+    """Return the StoredReplies key for a file."""
+    return f"file:{owner}/{repo}/{file_path}"
+
+
+def _cached_file_result(owner, repo, file_path, tree=None):
+    """Return a reply for a file kept from earlier in this run or a past one.
+
+    When the repository has been listed, a reply from a past run is only used
+    if the listing shows the file's SHA is unchanged. Otherwise it is used
+    while it is younger than ``CACHE_TTL``. A listing that has not been kept
+    in ``_REPO_TREES`` yet can be passed as tree.
+    """
+    if not USE_CACHE:
+        return None
+    if (owner, repo, file_path) in _FILE_CACHE:
+        return _FILE_CACHE[(owner, repo, file_path)]
+
+    if tree is None:
+        tree = _REPO_TREES.get((owner, repo))
+    sha = tree.get(file_path) if tree is not None else None
+    if tree is not None and not sha:
+        return None
+    file_result = STORED_REPLIES.get(_stored_file_key(owner, repo, file_path), sha)
+    if file_result is not None:
+        _FILE_CACHE[(owner, repo, file_path)] = file_result
+    return file_result
+
+
+def _file_sha(file_result):
+    """Return the blob SHA from a get_file_contents reply, or None."""
+    for response in file_result:
+        result = response.get("result")
+        if not isinstance(result, dict) or result.get("isError"):
+            continue
+        for item in result.get("content", []):
+            try:
+                data = json.loads(item["text"])
+            except (KeyError, TypeError, json.JSONDecodeError):
+                continue
+            if isinstance(data, dict) and isinstance(data.get("sha"), str):
+                return data["sha"]
+    return None
+
+
+def _candidate_payloads(result):
+    """Yield (method, is_base64, payload) for each place file content may be.
+
+    get_file_contents replies have come in a few shapes: a list of text items,
+    either under ``result["content"]`` or as the result itself, whose text is a
+    JSON object with a base64 ``content`` field, or a bare base64 string in
+    ``result["content"]``. The text is parsed as JSON first and only searched
+    with a regex when it is not valid JSON.
+    """
+    items = result.get("content") if isinstance(result, dict) else result
+
+    if isinstance(items, str):
+        yield "direct content", True, items
+        return
+    if not isinstance(items, list):
+        return
+
+    for item in items:
+        text = item.get("text") if isinstance(item, dict) else None
+        if not isinstance(text, str):
+            continue
+
+        try:
+            text_json = json.loads(text)
+        except json.JSONDecodeError:
+            # Try to extract pattern from text: {"content":"BASE64DATA"}
+            content_match = _CONTENT_RE.search(text)
+            if content_match:
+                # The base64 may still hold escaped newlines
+                yield "regex", True, content_match.group(1).replace("\\n", "")
+            elif isinstance(result, list) and text.startswith(("{", "[")):
+                # Maybe the text is directly the content (not base64 encoded)
+                yield "raw text", False, text
+            continue
+
+        if isinstance(text_json, dict) and isinstance(text_json.get("content"), str):
+            yield "JSON", True, text_json["content"]
+
+
+def _decode_file_payload(result):
+    """Return the text of a file from a get_file_contents result, or None."""
+    for method, is_base64, payload in _candidate_payloads(result):
+        if not is_base64:
+            return payload
+        try:
+            content = _decode_base64(payload)
+        except ValueError as e:
+            console.print(f"[dim]Base64 decode error: {str(e)[:100]}[/]")
+            continue
+        console.print(f"[dim]Successfully extracted content using {method}[/]")
+        return content
+    return None
+
+
+def get_repo_tree(owner, repo):
+    """Return {path: sha} for every file in a repository, or None.
+
+    One get_repository_tree call lists the whole repository, so callers can
+    tell which candidate paths exist without requesting each one. Listings
+    are cached per repository. None means the server has no tree tool, the
+    call failed or the listing was truncated, and callers should fall back to
+    probing paths directly.
+    """
+    files = _stored_tree(owner, repo)
+    if files is not None:
+        return files
+
+    tools_list = get_tools_list(show_request=False)
+    if not tools_list or not any(
+        t["name"] == "get_repository_tree" for t in tools_list
+    ):
+        return None
+
+    console.print(f"\n[bold]Listing files in {owner}/{repo}...[/]")
+    tree_result = run_mcp_command("tools/call", repo_tree_params(owner, repo))
+
+    files = _parse_repo_tree(tree_result)
+    if files is not None:
+        _REPO_TREES[(owner, repo)] = files
+        if USE_CACHE:
+            STORED_REPLIES.put(f"tree:{owner}/{repo}", files)
+    return files
+
+
+def _parse_repo_tree(tree_result):
+    """Return {path: sha} from a get_repository_tree reply, or None."""
+    valid_tree = next((r for r in tree_result or [] if "result" in r), None)
+    if not valid_tree or not isinstance(valid_tree["result"], dict):
+        return None
+
+    for item in valid_tree["result"].get("content", []):
+        try:
+            data = json.loads(item["text"])
+        except (KeyError, TypeError, json.JSONDecodeError):
+            continue
+        if not isinstance(data, dict) or not isinstance(data.get("tree"), list):
+            continue
+        if data.get("truncated"):
+            # A partial listing cannot show that a path is missing
+            return None
+
+        return {
+            entry["path"]: entry.get("sha")
+            for entry in data["tree"]
+            if isinstance(entry, dict) and entry.get("type") == "blob"
+        }
+
+    return None
+
+
+def _stored_tree(owner, repo):
+    """Return a file listing kept from this run or a recent one, or None."""
+    if not USE_CACHE:
+        return None
+    if (owner, repo) not in _REPO_TREES:
+        files = STORED_REPLIES.get(f"tree:{owner}/{repo}")
+        if files is None:
+            return None
+        _REPO_TREES[(owner, repo)] = files
+    return _REPO_TREES[(owner, repo)]
+
+
+def _has_stored_result(method, params):
+    """Return True if a tools/list or tools/call result would come from a cache."""
+    if method == "tools/list":
+        return _stored_tools() is not None
+    args = params["arguments"]
+    if params["name"] == "get_file_contents":
+        return (
+            _cached_file_result(args["owner"], args["repo"], args["path"]) is not None
+        )
+    if params["name"] == "get_repository_tree":
+        return _stored_tree(args["owner"], args["repo"]) is not None
+    return False
+
+
+def probe_paths(owner, repo, paths):
+    """Yield each path in order after requesting it ahead of time.
+
+    Requests for up to ``_MAX_PROBES_IN_FLIGHT`` paths are sent together, so
+    their round trips overlap while the caller still fetches and checks one
+    path at a time in priority order with get_specific_file. A caller that
+    stops at the first hit only leaves the rest of the current window unread.
+    """
+    for start in range(0, len(paths), _MAX_PROBES_IN_FLIGHT):
+        window = paths[start : start + _MAX_PROBES_IN_FLIGHT]
+        prefetch_mcp_commands(
+            [
+                ("tools/call", file_contents_params(owner, repo, p))
+                for p in window
+                if _cached_file_result(owner, repo, p) is None
+            ]
+        )
+        yield from window
+
+
+def prefetch_doc_files(owner, repo):
+    """Request the first documentation files read_api_docs will look for.
+
+    This runs on a worker thread during run_all_demos. It waits for the
+    repository listing sent in the up-front batch, then requests the first
+    documentation path the listing contains without printing anything, so
+    its reply is in flight before read_api_docs asks. Later paths are only
+    read if that one does not decode, so they are not requested ahead.
+    """
+    _, tree_future = _PREFETCHED.get(
+        _request_key("tools/call", repo_tree_params(owner, repo)), (None, None)
+    )
+    if tree_future is None:
+        return  # the listing was kept from an earlier run or is not requested
+    try:
+        tree = _parse_repo_tree([tree_future.result(timeout=_REPLY_TIMEOUT)])
+    except (OSError, MCPSessionError):
+        return  # get_repo_tree reports the failure when the listing is read
+    if tree is None:
+        return
+
+    _, paths = _doc_candidates(owner, repo, tree)
+    paths = [p for p in paths if _cached_file_result(owner, repo, p, tree) is None]
+    prefetch_mcp_commands(
+        [("tools/call", file_contents_params(owner, repo, p)) for p in paths[:1]]
+    )
+
+
+def _doc_candidates(owner, repo, tree):
+    """Return (has_docs, paths) for where to look for API documentation.
+
+    has_docs tells whether the repository has a docs directory, or is None
+    when that cannot be told. With a listing from get_repo_tree it is read
+    from the listing and paths the listing lacks are left out; without one, a
+    request for "docs" decides.
+    """
+    if tree is not None:
+        has_docs = any(path.startswith("docs/") for path in tree)
+    else:
+        has_docs = None
+        docs_result = get_specific_file(owner, repo, "docs")
+        if docs_result:
+            valid_file = next((r for r in docs_result if "result" in r), None)
+            has_docs = bool(valid_file and "message" not in valid_file)
+
+    # Without a docs directory, look for common files at the root instead
+    paths = _ROOT_DOC_PATHS if has_docs is False else _DOC_PATHS
+    if tree is not None:
+        paths = [p for p in paths if p in tree]
+    return has_docs, paths
+
+
+def find_first_file(owner, repo, paths, tree=None):
+    """Return (path, content) for the first of paths that can be read.
+
+    Paths are tried in priority order and (None, None) is returned if none of
+    them has content. When a repository listing from get_repo_tree is given,
+    paths it does not contain are skipped without a request, and the rest are
+    fetched one at a time, since the first one nearly always decodes. Without
+    a listing, most paths are missing, so their requests are sent ahead in
+    windows by probe_paths.
+    """
+    if tree is not None:
+        paths = [p for p in paths if p in tree]
+
+    for path in paths if tree is not None else probe_paths(owner, repo, paths):
+        console.print(f"[dim]Checking {path}...[/]")
+        if (file_result := get_specific_file(owner, repo, path)) and (
+            file_content := extract_file_content(file_result)
+        ):
+            return path, file_content
+
+    return None, None
 
 
 def extract_file_content(file_result):
@@ -591,102 +1366,27 @@ def extract_file_content(file_result):
         console.print("[bold red]Failed to fetch file[/]")
         return None
 
-    valid_file = next((r for r in file_result if "result" in r), None)
-
-    if not valid_file or "result" not in valid_file:
+    valid_file = next(
+        (r for r in file_result if "result" in r and "message" not in r), None
+    )
+    if not valid_file:
         console.print("[bold red]Invalid file result response[/]")
         return None
 
     result = valid_file["result"]
-    file_content = None
 
     # For debugging the actual response
-    raw_result = json.dumps(result, indent=2)[:300]
-    console.print(f"[dim]Debug raw result: {raw_result}...[/]")
-
-    # Using a direct approach first: extract the content directly from the text field
-    if (
-        isinstance(result, dict)
-        and "content" in result
-        and isinstance(result["content"], list)
-    ):
-        for item in result["content"]:
-            if isinstance(item, dict) and "text" in item:
-                try:
-                    # The issue might be the escaped newlines in the base64 content
-                    raw_text = item["text"]
-
-                    # Try to extract pattern from text: {"content":"BASE64DATA"}
-                    import re
-
-                    content_match = re.search(r'"content"\s*:\s*"([^"]+)"', raw_text)
-
-                    if content_match:
-                        base64_data = content_match.group(1)
-                        # Replace escaped newlines
-                        base64_data = base64_data.replace("\\n", "")
-                        try:
-                            # Try to decode base64 content
-                            file_content = base64.b64decode(base64_data).decode("utf-8")
-                            console.print(
-                                "[dim]Successfully extracted content using regex[/]"
-                            )
-                            break
-                        except Exception as e:
-                            console.print(
-                                f"[dim]Base64 decode error: {str(e)[:100]}[/]"
-                            )
-                except Exception as e:
-                    console.print(f"[dim]Regex extraction error: {str(e)[:100]}[/]")
-
-    # If the regex approach failed, try the previous approaches
-    if not file_content:
-        console.print("[dim]Regex approach failed, trying JSON parsing methods...[/]")
-
-        # Try various response formats to extract file content
-        # Format 1: Direct content in result
-        if isinstance(result, dict) and "content" in result:
-            try:
-                if isinstance(result["content"], str):
-                    # Try to decode base64 content
-                    file_content = base64.b64decode(result["content"]).decode("utf-8")
-            except Exception as e:
-                console.print(f"[dim]Format 1 extraction failed: {e}[/]")
+    if DEBUG:
+        raw_result = json.dumps(result, indent=2)[:300]
+        console.print(f"[dim]Debug raw result: {raw_result}...[/]")
 
-        # Format 2: Result is a list of content items with text field
-        elif isinstance(result, list) and len(result) > 0:
-            for item in result:
-                if isinstance(item, dict) and "text" in item:
-                    try:
-                        text = item["text"].replace("\n", "").replace("\\n", "").strip()
-                        content_json = json.loads(text)
-
-                        if isinstance(content_json, dict) and "content" in content_json:
-                            # Try to decode base64 content
-                            file_content = base64.b64decode(
-                                content_json["content"]
-                            ).decode("utf-8")
-                            break
-                    except Exception as e:
-                        console.print(f"[dim]JSON parsing error: {str(e)[:100]}[/]")
-                        # Maybe the text is directly the content (not base64 encoded)
-                        if isinstance(item["text"], str) and (
-                            item["text"].startswith("{") or item["text"].startswith("[")
-                        ):
-                            try:
-                                # If it's JSON, format it nicely
-                                file_content = json.dumps(
-                                    json.loads(item["text"]), indent=2
-                                )
-                                break
-                            except json.JSONDecodeError as e:
-                                file_content = item["text"]
-                                break
+    file_content = _decode_file_payload(result)
 
     if not file_content:
         console.print("[bold yellow]Could not extract file content from response[/]")
-        console.print("[dim]Response structure (truncated):[/]")
-        console.print(json.dumps(result, indent=2)[:300] + "...")
+        if DEBUG:
+            console.print("[dim]Response structure (truncated):[/]")
+            console.print(json.dumps(result, indent=2)[:300] + "...")
 
     return file_content
 
@@ -742,95 +1442,57 @@ def read_api_docs():
     owner = "VectorInstitute"
     repo = "health-rec"
 
-    # First, check if the repository has common API documentation locations
-    possible_doc_paths = [
-        "docs/api.md",
-        "docs/API.md",
-        "docs/api/README.md",
-        "docs/index.md",
-        "docs/api/index.md",
-        "docs/README.md",
-        "docs/usage.md",
-        "API.md",
-        "api.md",
-    ]
-
     # Try to find which API doc file exists
     console.print(f"\n[bold]Searching for API documentation in {owner}/{repo}...[/]")
 
-    # Let's first check if a docs directory exists
-    docs_result = get_specific_file(owner, repo, "docs")
+    # List the repository once so only paths that exist are fetched below
+    tree = get_repo_tree(owner, repo)
 
-    if docs_result:
-        valid_file = next((r for r in docs_result if "result" in r), None)
-        if valid_file and "result" in valid_file and "message" not in valid_file:
-            console.print(
-                "[bold green]Found docs directory. Looking for API documentation files...[/]"
-            )
-        else:
-            # If docs directory doesn't exist, try common files at root
-            console.print(
-                "[dim]No docs directory found. Looking for API documentation at repository root...[/]"
-            )
-            possible_doc_paths = [
-                "API.md",
-                "api.md",
-                "USAGE.md",
-                "usage.md",
-                "README.md",
-            ]
+    # Check if a docs directory exists and pick the common API documentation
+    # locations to try; has_docs is None when we could not tell
+    has_docs, possible_doc_paths = _doc_candidates(owner, repo, tree)
 
-    # Search for API documentation files
-    api_doc_content = None
-    api_doc_path = None
-
-    for path in possible_doc_paths:
-        console.print(f"[dim]Checking {path}...[/]")
-        file_result = get_specific_file(owner, repo, path)
+    if has_docs:
+        console.print(
+            "[bold green]Found docs directory. Looking for API documentation files...[/]"
+        )
+    elif has_docs is not None:
+        console.print(
+            "[dim]No docs directory found. Looking for API documentation at repository root...[/]"
+        )
 
-        if file_result:
-            valid_file = next(
-                (r for r in file_result if "result" in r and "message" not in r), None
-            )
-            if valid_file and "result" in valid_file:
-                api_doc_content = extract_file_content(file_result)
-                if api_doc_content:
-                    api_doc_path = path
-                    console.print(f"[bold green]Found API documentation at {path}[/]")
-                    break
+    # Search for API documentation files, skipping any the listing rules out
+    api_doc_path, api_doc_content = find_first_file(
+        owner, repo, possible_doc_paths, tree
+    )
+    if api_doc_content:
+        console.print(f"[bold green]Found API documentation at {api_doc_path}[/]")
 
     # As a fallback, if we didn't find any of the common files, look for README.md
-    # in root or docs directory
-    if not api_doc_content:
+    # in root or docs directory, unless it was already one of the candidates
+    readme_tried = "README.md" in possible_doc_paths
+    if (
+        not api_doc_content
+        and not readme_tried
+        and (tree is None or "README.md" in tree)
+    ):
         console.print(
             "[dim]No specific API documentation found. Trying README.md...[/]"
         )
-        readme_result = get_specific_file(owner, repo, "README.md")
-
-        if readme_result:
-            api_doc_content = extract_file_content(readme_result)
-            if api_doc_content:
-                api_doc_path = "README.md"
-                console.print(
-                    "[bold green]Using README.md as it may contain API information[/]"
-                )
+        api_doc_path, api_doc_content = find_first_file(owner, repo, ["README.md"])
+        if api_doc_content:
+            console.print(
+                "[bold green]Using README.md as it may contain API information[/]"
+            )
 
     # Display the API documentation if found
     if api_doc_content:
         display_file_content(api_doc_path, owner, repo, api_doc_content)
 
         # Check if the content actually has API documentation
-        api_keywords = [
-            "api",
-            "function",
-            "method",
-            "class",
-            "parameter",
-            "usage",
-            "example",
-        ]
-        has_api_content = any(
-            keyword in api_doc_content.lower() for keyword in api_keywords
+        has_api_content = (
+            _API_KEYWORDS_RE.search(api_doc_content, 0, _API_KEYWORDS_SCAN_CHARS)
+            is not None
         )
 
         if not has_api_content:
@@ -840,23 +1502,12 @@ def read_api_docs():
 
             # Try to find a Python example file as another approach
             console.print("[dim]Looking for Python example files...[/]")
-            example_paths = [
-                "examples/example.py",
-                "example.py",
-                "examples/demo.py",
-                "demo.py",
-            ]
-
-            for path in example_paths:
-                example_result = get_specific_file(owner, repo, path)
-                if example_result:
-                    example_content = extract_file_content(example_result)
-                    if example_content:
-                        console.print(
-                            "[bold green]Found an example file that might help with API usage:[/]"
-                        )
-                        display_file_content(path, owner, repo, example_content)
-                        break
+            path, example_content = find_first_file(owner, repo, _EXAMPLE_PATHS, tree)
+            if example_content:
+                console.print(
+                    "[bold green]Found an example file that might help with API usage:[/]"
+                )
+                display_file_content(path, owner, repo, example_content)
     else:
         console.print(
             "[bold red]Could not find API documentation for this repository.[/]"
@@ -866,29 +1517,32 @@ def read_api_docs():
         console.print(
             "[dim]Trying to find a Python source file that might demonstrate API usage...[/]"
         )
-        source_paths = [
-            "src/main.py",
-            "src/__init__.py",
-            "cyclops/__init__.py",
-            "main.py",
-        ]
-
-        for path in source_paths:
-            source_result = get_specific_file(owner, repo, path)
-            if source_result:
-                source_content = extract_file_content(source_result)
-                if source_content:
-                    console.print(
-                        "[bold green]Found a source file that might help understand the API:[/]"
-                    )
-                    display_file_content(path, owner, repo, source_content)
-                    break
+        path, source_content = find_first_file(owner, repo, _SOURCE_PATHS, tree)
+        if source_content:
+            console.print(
+                "[bold green]Found a source file that might help understand the API:[/]"
+            )
+            display_file_content(path, owner, repo, source_content)
 
 
 def run_all_demos():
     """Run all demo functions."""
     header("GitHub MCP Server in Stdio Mode - Full Demo")
 
+    # Send every request the demos are known to make up front in one batch,
+    # leaving out those whose results were kept from an earlier run
+    calls = [
+        ("tools/list", None),
+        ("tools/call", search_repos_params("stars:>10000", 3)),
+        ("tools/call", file_contents_params("facebook", "react", "README.md")),
+        ("tools/call", search_repos_params("org:VectorInstitute", 5)),
+        (
+            "tools/call",
+            file_contents_params("VectorInstitute", "vector-inference", "README.md"),
+        ),
+    ]
+    prefetch_mcp_commands([c for c in calls if not _has_stored_result(*c)])
+
     # Get list of tools
     console.print("\n[bold]Fetching available GitHub tools...[/]")
     tools_list = get_tools_list(show_request=False)
@@ -898,23 +1552,38 @@ def run_all_demos():
         console.print("[bold red]Failed to retrieve tools list.[/]")
         return
 
-    # Display tools
-    display_tools(tools_list)
+    # The repository the last demo searches is only listed once the catalog
+    # shows the server offers get_repository_tree
+    tree_call = ("tools/call", repo_tree_params("VectorInstitute", "health-rec"))
+    offers_tree = any(t["name"] == "get_repository_tree" for t in tools_list)
+    if offers_tree and not _has_stored_result(*tree_call):
+        prefetch_mcp_commands([tree_call])
+
+    # Request the docs the last demo needs as soon as their listing arrives,
+    # while the demos before it render from replies already on their way
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        docs_prefetch = executor.submit(
+            prefetch_doc_files, "VectorInstitute", "health-rec"
+        )
 
-    # Search for popular repositories
-    search_popular_repos()
+        # Display tools
+        display_tools(tools_list)
 
-    # Get README content
-    get_readme_content()
+        # Search for popular repositories
+        search_popular_repos()
 
-    # List organization repositories
-    list_org_repos()
+        # Get README content
+        get_readme_content()
 
-    # Get specific file from repository
-    fetch_specific_repo_file()
+        # List organization repositories
+        list_org_repos()
 
-    # Find and display API documentation
-    read_api_docs()
+        # Get specific file from repository
+        fetch_specific_repo_file()
+
+        # Find and display API documentation once its files have been requested
+        docs_prefetch.result()
+        read_api_docs()
 
     console.print("\n[bold green]Demo completed successfully![/]")
 
@@ -923,28 +1592,44 @@ def list_available_demos():
     """List all available demos with descriptions."""
     header("Available GitHub MCP Demos")
 
+    console.print(_build_demos_table())
+    console.print(
+        "\n[bold]Example usage:[/] python github_mcp_example.py --search_repos"
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _build_demos_table():
+    """Build the demo options table once; rich can print the same table again."""
     table = Table(title="Demo Options", show_header=True, header_style="bold magenta")
     table.add_column("Flag", style="cyan")
     table.add_column("Description")
 
-    demos = [
-        ("--list_demos", "List all available demos"),
-        ("--display_tools", "Show available GitHub MCP tools"),
-        ("--search_repos", "Search for popular GitHub repositories"),
-        ("--get_readme", "Fetch and display README from a repository"),
-        ("--list_org_repos", "List repositories from a specific organization"),
-        ("--get_repo_file", "Fetch a specific file from a repository"),
-        ("--get_api_docs", "Find and display API documentation"),
-        ("--run_all", "Run all demos in sequence"),
-    ]
-
-    for demo in demos:
-        table.add_row(demo[0], demo[1])
-
-    console.print(table)
-    console.print(
-        "\n[bold]Example usage:[/] python github_mcp_example.py --search_repos"
-    )
+    for flag, help_text, _ in _DEMO_SPECS:
+        table.add_row(f"--{flag}", help_text)
+
+    return table
+
+
+# Demo flag, description and function, in the order main() runs them
+_DEMO_SPECS = [
+    ("list_demos", "List all available demos", list_available_demos),
+    ("display_tools", "Show available GitHub MCP tools", display_available_tools),
+    ("search_repos", "Search for popular GitHub repositories", search_popular_repos),
+    ("get_readme", "Fetch and display README from a repository", get_readme_content),
+    (
+        "list_org_repos",
+        "List repositories from a specific organization",
+        list_org_repos,
+    ),
+    (
+        "get_repo_file",
+        "Fetch a specific file from a repository",
+        fetch_specific_repo_file,
+    ),
+    ("get_api_docs", "Find and display API documentation", read_api_docs),
+    ("run_all", "Run all demos in sequence", run_all_demos),
+]
 
 
 def parse_arguments():
@@ -952,37 +1637,24 @@ def parse_arguments():
     parser = argparse.ArgumentParser(description="GitHub MCP Server Demo")
 
     # Add a flag for each demo function
+    for flag, help_text, _ in _DEMO_SPECS:
+        parser.add_argument(f"--{flag}", action="store_true", help=help_text)
     parser.add_argument(
-        "--list_demos", action="store_true", help="List all available demos"
-    )
-    parser.add_argument(
-        "--display_tools", action="store_true", help="Show available GitHub MCP tools"
-    )
-    parser.add_argument(
-        "--search_repos",
-        action="store_true",
-        help="Search for popular GitHub repositories",
-    )
-    parser.add_argument(
-        "--get_readme",
+        "--no-cache",
         action="store_true",
-        help="Fetch and display README from a repository",
+        help="Fetch tools, trees and files again instead of reusing earlier results",
     )
     parser.add_argument(
-        "--list_org_repos",
-        action="store_true",
-        help="List repositories from a specific organization",
+        "--cache-ttl",
+        type=float,
+        default=CACHE_TTL,
+        metavar="SECONDS",
+        help="How long results kept from earlier runs are reused without checking them (default: %(default)s)",
     )
     parser.add_argument(
-        "--get_repo_file",
+        "--debug",
         action="store_true",
-        help="Fetch a specific file from a repository",
-    )
-    parser.add_argument(
-        "--get_api_docs", action="store_true", help="Find and display API documentation"
-    )
-    parser.add_argument(
-        "--run_all", action="store_true", help="Run all demos in sequence"
+        help="Print raw response structures while extracting file content",
     )
 
     return parser.parse_args()
@@ -990,54 +1662,23 @@ def parse_arguments():
 
 def main():
     """Run main function to run the GitHub MCP server demo."""
+    global DEBUG, USE_CACHE, CACHE_TTL  # noqa: PLW0603
     args = parse_arguments()
+    DEBUG = args.debug
+    USE_CACHE = not args.no_cache
+    CACHE_TTL = args.cache_ttl
 
-    # Check if any flag was specified
-    any_flag_specified = any(
-        [
-            args.list_demos,
-            args.display_tools,
-            args.search_repos,
-            args.get_readme,
-            args.list_org_repos,
-            args.get_repo_file,
-            args.get_api_docs,
-            args.run_all,
-        ]
-    )
-
-    # If no flags specified, run all demos (default behavior)
-    if not any_flag_specified:
+    # Run the demos based on the specified flags, in table order
+    selected = [demo for flag, _, demo in _DEMO_SPECS if getattr(args, flag)]
+    if not selected:
         list_available_demos()
         console.print(
             "\n[bold yellow]No demo specified. Use one of the flags above to run a specific demo.[/]"
         )
         return
 
-    # Run the demos based on the specified flags
-    if args.list_demos:
-        list_available_demos()
-
-    if args.display_tools:
-        display_available_tools()
-
-    if args.search_repos:
-        search_popular_repos()
-
-    if args.get_readme:
-        get_readme_content()
-
-    if args.list_org_repos:
-        list_org_repos()
-
-    if args.get_repo_file:
-        fetch_specific_repo_file()
-
-    if args.get_api_docs:
-        read_api_docs()
-
-    if args.run_all:
-        run_all_demos()
+    for demo in selected:
+        demo()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,68 @@
+"""Shared fixtures for the github_mcp_example tests."""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+import github_mcp_example as gh
+
+
+STUB = Path(__file__).with_name("mcp_stub.py")
+
+
+@pytest.fixture
+def stub_log(tmp_path):
+    """Return a function that lists the requests the stub server has received."""
+    path = tmp_path / "requests.log"
+
+    def read():
+        if not path.exists():
+            return []
+        return path.read_text(encoding="utf-8").splitlines()
+
+    read.path = path
+    return read
+
+
+@pytest.fixture
+def stub_server(tmp_path, stub_log):
+    """Return a function that makes an MCPSession for the stub with a config."""
+    sessions = []
+
+    def start(**config):
+        config.setdefault("log", str(stub_log.path))
+        path = tmp_path / f"stub{len(sessions)}.json"
+        path.write_text(json.dumps(config), encoding="utf-8")
+        session = gh.MCPSession([sys.executable, str(STUB), str(path)])
+        sessions.append(session)
+        return session
+
+    yield start
+    for session in sessions:
+        session.disconnect()
+
+
+@pytest.fixture
+def mcp(stub_server, monkeypatch, tmp_path):
+    """Return a function that points the demos at a stub server with a config.
+
+    Run-wide caches start empty and nothing is read from or kept in the
+    user's result cache.
+    """
+    monkeypatch.setattr(gh, "_PREFETCHED", {})
+    monkeypatch.setattr(gh, "_TOOLS_CACHE", None)
+    monkeypatch.setattr(gh, "_REPO_TREES", {})
+    monkeypatch.setattr(gh, "_FILE_CACHE", {})
+    monkeypatch.setattr(gh, "USE_CACHE", True)
+    monkeypatch.setattr(
+        gh, "STORED_REPLIES", gh.StoredReplies(tmp_path / "replies.json")
+    )
+
+    def start(**config):
+        session = stub_server(**config)
+        monkeypatch.setattr(gh, "MCP_SESSION", session)
+        return session
+
+    return start
@@ -0,0 +1,118 @@
+"""Stand-in for the GitHub MCP server's stdio mode, used by the tests.
+
+Run as ``python mcp_stub.py CONFIG`` where CONFIG is a JSON file with:
+
+- ``files``: {path: text} for the files get_file_contents can return
+- ``tree``: paths listed by get_repository_tree; the tool is only offered
+  when this is given
+- ``log``: file each request is appended to, one line per request
+- ``reverse``: hold the first this many requests and answer them in reverse
+- ``delay``: {method or tool name: seconds} to wait before answering
+- ``exit_on``: method or tool name that makes the server exit, unanswered,
+  after writing ``stderr`` and the process id to its stderr
+"""
+
+import base64
+import json
+import os
+import sys
+import time
+
+
+def _text(payload):
+    """Wrap a payload the way the server wraps tool results."""
+    return {"content": [{"type": "text", "text": json.dumps(payload)}]}
+
+
+def _tools(config):
+    """Return the tool catalog, with the tree tool only if a tree is set."""
+    names = ["search_repositories", "get_file_contents"]
+    if "tree" in config:
+        names.append("get_repository_tree")
+    return {"tools": [{"name": n, "description": n} for n in names]}
+
+
+def _call(config, name, args):
+    """Return the result of a tools/call request."""
+    if name == "get_file_contents":
+        text = config.get("files", {}).get(args["path"])
+        if text is None:
+            return {
+                "content": [{"type": "text", "text": "404 Not Found"}],
+                "isError": True,
+            }
+        return _text(
+            {
+                "path": args["path"],
+                "sha": f"sha-{args['path']}",
+                "content": base64.encodebytes(text.encode()).decode(),
+                "encoding": "base64",
+            }
+        )
+    if name == "get_repository_tree":
+        return _text(
+            {
+                "truncated": False,
+                "tree": [
+                    {"path": p, "type": "blob", "sha": f"sha-{p}"}
+                    for p in config["tree"]
+                ],
+            }
+        )
+    return _text({"items": []})
+
+
+def _describe(request):
+    """Return the log line and the delay/exit key for a request."""
+    if request["method"] != "tools/call":
+        return request["method"], request["method"]
+    name = request["params"]["name"]
+    path = request["params"]["arguments"].get("path")
+    return (f"{name} {path}" if path else name), name
+
+
+def _answer(config, request):
+    """Write the reply to one request, or exit if the config says so."""
+    line, key = _describe(request)
+    if config.get("exit_on") == key:
+        print(f"{config.get('stderr', '')} (pid {os.getpid()})", file=sys.stderr)
+        sys.exit(3)
+    time.sleep(config.get("delay", {}).get(key, 0))
+
+    if request["method"] == "tools/list":
+        result = _tools(config)
+    else:
+        result = _call(
+            config, request["params"]["name"], request["params"]["arguments"]
+        )
+    reply = {"jsonrpc": "2.0", "id": request["id"], "result": result}
+    sys.stdout.write(json.dumps(reply) + "\n")
+    sys.stdout.flush()
+
+
+def main():
+    """Answer JSON-RPC requests from stdin until it closes."""
+    with open(sys.argv[1], encoding="utf-8") as f:
+        config = json.load(f)
+    print("GitHub MCP Server running on stdio", file=sys.stderr, flush=True)
+
+    held = []
+    for raw in sys.stdin:
+        if not raw.strip():
+            continue
+        request = json.loads(raw)
+        if config.get("log"):
+            with open(config["log"], "a", encoding="utf-8") as f:
+                f.write(_describe(request)[0] + "\n")
+
+        if len(held) < config.get("reverse", 0):
+            held.append(request)
+            if len(held) == config["reverse"]:
+                for waiting in reversed(held):
+                    _answer(config, waiting)
+            continue
+        _answer(config, request)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Tests for reading file content out of get_file_contents replies."""
+
+import base64
+import json
+
+import pytest
+
+import github_mcp_example as gh
+
+
+def _encode(text):
+    """Return text as GitHub-style base64 with a line break every 60 characters."""
+    return base64.encodebytes(text.encode("utf-8")).decode("ascii")
+
+
+@pytest.mark.parametrize(
+    ("result", "expected"),
+    [
+        # A text item whose JSON holds the base64 content
+        (
+            {
+                "content": [
+                    {"type": "text", "text": json.dumps({"content": _encode("A")})}
+                ]
+            },
+            [("JSON", True, _encode("A"))],
+        ),
+        # The list of text items as the result itself
+        (
+            [{"type": "text", "text": json.dumps({"content": _encode("B")})}],
+            [("JSON", True, _encode("B"))],
+        ),
+        # A bare base64 string under content
+        ({"content": _encode("C")}, [("direct content", True, _encode("C"))]),
+        # Text that is not valid JSON but still carries a content field
+        (
+            {"content": [{"type": "text", "text": '{"content":"RA==\\n"} trailing'}]},
+            [("regex", True, "RA==")],
+        ),
+        # Errors and other replies without file content
+        ({"content": [{"type": "text", "text": "404 Not Found"}]}, []),
+        ({"content": [{"type": "image", "data": "..."}]}, []),
+        ({"isError": True}, []),
+    ],
+)
+def test_candidate_payloads(result, expected):
+    """Test each known get_file_contents reply shape yields its payload."""
+    assert list(gh._candidate_payloads(result)) == expected
+
+
+def test_decode_file_payload_decodes_base64():
+    """Test file content is decoded from base64 split across lines."""
+    text = "# Title\n\n" + "x" * 200
+    result = {
+        "content": [{"type": "text", "text": json.dumps({"content": _encode(text)})}]
+    }
+
+    assert gh._decode_file_payload(result) == text
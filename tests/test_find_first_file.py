@@ -0,0 +1,91 @@
+"""Tests for find_first_file."""
+
+import github_mcp_example as gh
+
+
+def test_returns_first_path_with_content_in_priority_order(mcp, stub_log):
+    """Test the highest-priority readable path wins, whatever else exists."""
+    mcp(files={"b.md": "second", "c.md": "third"})
+
+    assert gh.find_first_file("o", "r", ["a.md", "b.md", "c.md"]) == (
+        "b.md",
+        "second",
+    )
+
+
+def test_requests_a_window_of_paths_ahead(mcp, stub_log, monkeypatch):
+    """Test paths are requested a window at a time and the next window is not."""
+    monkeypatch.setattr(gh, "_MAX_PROBES_IN_FLIGHT", 2)
+    mcp(files={"b.md": "second"})
+
+    assert gh.find_first_file("o", "r", ["a.md", "b.md", "c.md", "d.md"]) == (
+        "b.md",
+        "second",
+    )
+    assert sorted(stub_log()) == [
+        "get_file_contents a.md",
+        "get_file_contents b.md",
+        "tools/list",
+    ]
+
+
+def test_skips_a_file_that_does_not_decode(mcp):
+    """Test a path whose reply has no content falls through to the next one."""
+    mcp(files={"a.md": "", "b.md": "second"})
+
+    assert gh.find_first_file("o", "r", ["a.md", "b.md"]) == ("b.md", "second")
+
+
+def test_returns_none_when_no_path_can_be_read(mcp):
+    """Test (None, None) comes back when every path is missing."""
+    mcp(files={})
+
+    assert gh.find_first_file("o", "r", ["a.md", "b.md"]) == (None, None)
+
+
+def test_listed_paths_are_fetched_one_at_a_time(mcp, stub_log):
+    """Test a listing leaves only the chosen path requested, not a window."""
+    mcp(files={"b.md": "second", "c.md": "third", "d.md": "fourth"})
+    tree = {"b.md": "sha-b.md", "c.md": "sha-c.md", "d.md": "sha-d.md"}
+
+    assert gh.find_first_file("o", "r", ["a.md", "b.md", "c.md", "d.md"], tree) == (
+        "b.md",
+        "second",
+    )
+    assert stub_log() == ["tools/list", "get_file_contents b.md"]
+
+
+def test_listed_path_that_does_not_decode_moves_to_the_next(mcp, stub_log):
+    """Test the next listed path is only requested after one fails to decode."""
+    mcp(files={"b.md": "", "c.md": "third", "d.md": "fourth"})
+    tree = {"b.md": "sha-b.md", "c.md": "sha-c.md", "d.md": "sha-d.md"}
+
+    assert gh.find_first_file("o", "r", ["b.md", "c.md", "d.md"], tree) == (
+        "c.md",
+        "third",
+    )
+    assert stub_log() == [
+        "tools/list",
+        "get_file_contents b.md",
+        "get_file_contents c.md",
+    ]
+
+
+def test_read_api_docs_fetches_only_the_first_listed_doc(mcp, stub_log):
+    """Test read_api_docs lists the repository and reads one doc file."""
+    paths = [
+        "docs/api.md",
+        "docs/index.md",
+        "docs/README.md",
+        "docs/usage.md",
+        "API.md",
+    ]
+    mcp(tree=paths, files=dict.fromkeys(paths, "API usage"))
+
+    gh.read_api_docs()
+
+    assert stub_log() == [
+        "tools/list",
+        "get_repository_tree",
+        "get_file_contents docs/api.md",
+    ]
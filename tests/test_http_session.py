@@ -0,0 +1,206 @@
+"""Tests for MCPHttpSession."""
+
+import http.client
+import json
+import threading
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import github_mcp_example as gh
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Answer MCP posts, rejecting initialize while the server says to."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):  # noqa: A002
+        """Keep the test output quiet."""
+
+    def do_POST(self):  # noqa: N802
+        """Record the post and reply to it."""
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        messages = body if isinstance(body, list) else [body]
+        self.server.posts.append(
+            ([m.get("method") for m in messages], self.headers.get("Mcp-Session-Id"))
+        )
+
+        if messages[0].get("method") == "initialize":
+            if self.server.reject_initialize:
+                self.server.reject_initialize -= 1
+                return self._reply(401, {"message": "Bad credentials"})
+            return self._reply(200, {"jsonrpc": "2.0", "id": body["id"], "result": {}})
+        if isinstance(body, dict) and "id" not in body:
+            return self._reply(202, None)
+
+        replies = [
+            {"jsonrpc": "2.0", "id": m["id"], "result": {"tools": []}} for m in messages
+        ]
+        return self._reply(200, replies if isinstance(body, list) else replies[0])
+
+    def _reply(self, status, payload):
+        """Send a JSON reply with the session id header."""
+        data = b"" if payload is None else json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Mcp-Session-Id", "session-1")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def http_server():
+    """Run the stub HTTP server on a free port for one test."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.posts = []
+    server.reject_initialize = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def http_session(http_server):
+    """Return an MCPHttpSession talking to the stub HTTP server."""
+    session = gh.MCPHttpSession(f"http://127.0.0.1:{http_server.server_port}/mcp")
+    yield session
+    session.disconnect()
+
+
+def test_failed_handshake_is_retried_on_the_next_call(http_server, http_session):
+    """Test a rejected initialize leaves no session for later calls to reuse."""
+    http_server.reject_initialize = 1
+
+    with pytest.raises(gh.MCPSessionError, match="HTTP 401"):
+        http_session.submit(gh.build_request("tools/list")).result(timeout=5)
+    reply = http_session.submit(gh.build_request("tools/list")).result(timeout=5)
+
+    assert reply["result"] == {"tools": []}
+    assert http_server.posts == [
+        (["initialize"], None),
+        (["initialize"], None),
+        (["notifications/initialized"], "session-1"),
+        (["tools/list"], "session-1"),
+    ]
+
+
+def test_failed_handshake_does_not_turn_off_batching(http_server, http_session):
+    """Test a batch that fails on the handshake is not taken as a rejection."""
+    http_server.reject_initialize = 1
+    futures = http_session.submit_many(
+        [gh.build_request("tools/list"), gh.build_request("tools/list")]
+    )
+
+    for future in futures.values():
+        with pytest.raises(gh.MCPSessionError, match="HTTP 401"):
+            future.result(timeout=5)
+    assert http_session._batching
+
+    futures = http_session.submit_many(
+        [gh.build_request("tools/list"), gh.build_request("tools/list")]
+    )
+    assert all(f.result(timeout=5)["result"] == {"tools": []} for f in futures.values())
+    assert http_server.posts[-1] == (["tools/list", "tools/list"], "session-1")
+
+
+def _batch_session(monkeypatch, send):
+    """Return an MCPHttpSession whose posts are handled by send."""
+    session = gh.MCPHttpSession("http://localhost:8092/mcp")
+    # As if the handshake had already been done
+    session._conn = http.client.HTTPConnection("localhost", 8092)
+    monkeypatch.setattr(session, "_send", send)
+    return session
+
+
+def _requests(count):
+    """Return count requests and a future for each, keyed by id."""
+    requests = [
+        {"jsonrpc": "2.0", "id": i, "method": "tools/list"} for i in range(count)
+    ]
+    return requests, {r["id"]: Future() for r in requests}
+
+
+def test_send_batch_uses_batch_replies(monkeypatch):
+    """Test a fully answered batch resolves every future in one post."""
+    posts = []
+
+    def send(message):
+        posts.append(message)
+        return {m["id"]: {"id": m["id"], "result": {}} for m in message}
+
+    session = _batch_session(monkeypatch, send)
+    requests, futures = _requests(3)
+    session._send_batch(requests, futures)
+
+    assert len(posts) == 1
+    assert [futures[i].result() for i in range(3)] == [
+        {"id": i, "result": {}} for i in range(3)
+    ]
+    assert session._batching
+
+
+def test_send_batch_falls_back_when_rejected(monkeypatch):
+    """Test a rejected batch is sent one request at a time, and not again."""
+    posts = []
+
+    def send(message):
+        posts.append(message)
+        if isinstance(message, list):
+            raise gh.MCPSessionError("batch rejected")
+        return {"id": message["id"], "result": {}}
+
+    session = _batch_session(monkeypatch, send)
+    requests, futures = _requests(2)
+    session._send_batch(requests, futures)
+
+    assert [futures[i].result()["id"] for i in range(2)] == [0, 1]
+    assert [isinstance(p, list) for p in posts] == [True, False, False]
+    assert not session._batching
+
+    # Later batches skip the batch post entirely
+    requests, futures = _requests(2)
+    session._send_batch(requests, futures)
+    assert [isinstance(p, list) for p in posts[3:]] == [False, False]
+
+
+def test_send_batch_sends_unanswered_requests_alone(monkeypatch):
+    """Test requests missing from a batch reply are sent on their own."""
+    posts = []
+
+    def send(message):
+        posts.append(message)
+        if isinstance(message, list):
+            return {0: {"id": 0, "result": "batched"}}
+        return {"id": message["id"], "result": "single"}
+
+    session = _batch_session(monkeypatch, send)
+    requests, futures = _requests(3)
+    session._send_batch(requests, futures)
+
+    assert [futures[i].result()["result"] for i in range(3)] == [
+        "batched",
+        "single",
+        "single",
+    ]
+    assert len(posts) == 3
+    assert not session._batching
+
+
+def test_send_batch_fails_futures_on_unexpected_error(monkeypatch):
+    """Test an unexpected error reaches every future instead of leaving it pending."""
+
+    def send(message):
+        raise ValueError("bad reply")
+
+    session = _batch_session(monkeypatch, send)
+    requests, futures = _requests(2)
+    session._send_batch(requests, futures)
+
+    for future in futures.values():
+        with pytest.raises(ValueError, match="bad reply"):
+            future.result(timeout=0)
@@ -0,0 +1,55 @@
+"""Tests for sending requests ahead of time with prefetch_mcp_commands."""
+
+import github_mcp_example as gh
+
+
+def test_prefetched_reply_is_handed_to_run_mcp_command(mcp, stub_log):
+    """Test a later call with the same method and params reuses the request."""
+    mcp(files={"README.md": "hello"})
+    params = gh.file_contents_params("o", "r", "README.md")
+
+    gh.prefetch_mcp_commands([("tools/list", None), ("tools/call", params)])
+    tools = gh.run_mcp_command("tools/list", show_request=False)
+    readme = gh.run_mcp_command("tools/call", params, show_request=False)
+
+    assert tools[0]["result"]["tools"]
+    assert gh._decode_file_payload(readme[0]["result"]) == "hello"
+    assert stub_log() == ["tools/list", "get_file_contents README.md"]
+    assert gh._PREFETCHED == {}
+
+
+def test_unprefetched_call_sends_its_own_request(mcp, stub_log):
+    """Test calls that were not prefetched are sent when they are made."""
+    mcp()
+
+    gh.prefetch_mcp_commands([("tools/list", None)])
+    gh.run_mcp_command("tools/list", show_request=False)
+    gh.run_mcp_command("tools/list", show_request=False)
+
+    assert stub_log() == ["tools/list", "tools/list"]
+
+
+def test_prefetch_skips_calls_already_in_flight(mcp, stub_log):
+    """Test prefetching the same call twice sends a single request."""
+    mcp()
+
+    gh.prefetch_mcp_commands([("tools/list", None)])
+    _, future = gh._PREFETCHED[gh._request_key("tools/list", None)]
+    gh.prefetch_mcp_commands([("tools/list", None)])
+    future.result(timeout=5)
+
+    assert stub_log() == ["tools/list"]
+
+
+def test_prefetch_doc_files_requests_only_the_first_doc(mcp, stub_log):
+    """Test the doc prefetch sends one request for the first listed doc path."""
+    paths = ["docs/api.md", "docs/index.md", "docs/README.md", "API.md"]
+    mcp(tree=paths, files=dict.fromkeys(paths, "API usage"))
+    gh.prefetch_mcp_commands([("tools/call", gh.repo_tree_params("o", "r"))])
+
+    gh.prefetch_doc_files("o", "r")
+    params = gh.file_contents_params("o", "r", "docs/api.md")
+    _, future = gh._PREFETCHED[gh._request_key("tools/call", params)]
+    future.result(timeout=5)
+
+    assert stub_log() == ["get_repository_tree", "get_file_contents docs/api.md"]
@@ -0,0 +1,86 @@
+"""Tests for MCPSession and the reply timeout in run_mcp_command."""
+
+import time
+
+import pytest
+
+import github_mcp_example as gh
+
+
+def test_replies_reach_their_futures_out_of_order(stub_server):
+    """Test each reply resolves the future for its own id, whatever the order."""
+    session = stub_server(reverse=2, files={"README.md": "hello"})
+    tools = gh.build_request("tools/list")
+    readme = gh.build_request(
+        "tools/call", gh.file_contents_params("o", "r", "README.md")
+    )
+
+    futures = session.submit_many([tools, readme])
+
+    assert futures[tools["id"]].result(timeout=5)["result"]["tools"]
+    file_result = futures[readme["id"]].result(timeout=5)
+    assert file_result["id"] == readme["id"]
+    assert gh._decode_file_payload(file_result["result"]) == "hello"
+    assert session._waiting == {}
+
+
+def test_server_exit_fails_pending_futures_with_stderr(stub_server):
+    """Test every unanswered request fails with the server's exit code and logs."""
+    session = stub_server(exit_on="tools/list", stderr="bad credentials")
+    futures = session.submit_many(
+        [gh.build_request("tools/list"), gh.build_request("tools/list")]
+    )
+
+    for future in futures.values():
+        with pytest.raises(gh.MCPSessionError, match="return code 3") as error:
+            future.result(timeout=5)
+        assert "bad credentials" in str(error.value)
+    assert session._waiting == {}
+
+
+def test_respawn_gets_fresh_waiting_table_and_stderr(stub_server):
+    """Test a restarted server reports only its own stderr."""
+    session = stub_server(exit_on="tools/list", stderr="bad credentials")
+
+    with pytest.raises(gh.MCPSessionError) as first:
+        session.submit(gh.build_request("tools/list")).result(timeout=5)
+    first_pid = session.proc.pid
+    first_waiting = session._waiting
+
+    with pytest.raises(gh.MCPSessionError) as second:
+        session.submit(gh.build_request("tools/list")).result(timeout=5)
+
+    assert session.proc.pid != first_pid
+    assert session._waiting is not first_waiting
+    assert f"pid {first_pid}" in str(first.value)
+    assert f"pid {session.proc.pid}" in str(second.value)
+    assert f"pid {first_pid}" not in str(second.value)
+
+
+def test_discarded_request_drops_its_late_reply(stub_server):
+    """Test a reply that arrives after discard resolves nothing and is not kept."""
+    session = stub_server(delay={"tools/list": 0.3})
+    request = gh.build_request("tools/list")
+    future = session.submit(request)
+
+    session.discard(request["id"])
+    time.sleep(0.6)
+
+    assert not future.done()
+    assert request["id"] not in session._waiting
+    assert request["id"] not in session.raw_previews
+
+
+def test_run_mcp_command_gives_up_after_timeout(stub_server, monkeypatch, capsys):
+    """Test a request with no reply fails as "Command failed" instead of hanging."""
+    session = stub_server(delay={"tools/list": 0.5})
+    monkeypatch.setattr(gh, "MCP_SESSION", session)
+    monkeypatch.setattr(gh, "_REPLY_TIMEOUT", 0.1)
+
+    assert gh.run_mcp_command("tools/list", show_request=False) is None
+    assert "Command failed" in capsys.readouterr().out
+    assert session._waiting == {}
+
+    # The session still answers the next request once the slow one is done
+    monkeypatch.setattr(gh, "_REPLY_TIMEOUT", 5)
+    assert gh.run_mcp_command("tools/list", show_request=False)
@@ -0,0 +1,73 @@
+"""Tests for StoredReplies, the on-disk result cache."""
+
+import json
+
+import pytest
+
+import github_mcp_example as gh
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Control the time StoredReplies sees."""
+    now = [1_000_000.0]
+    monkeypatch.setattr(gh.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch, clock):
+    """Return an empty StoredReplies with a ten minute TTL."""
+    monkeypatch.setattr(gh, "CACHE_TTL", 600)
+    return gh.StoredReplies(tmp_path / "replies.json")
+
+
+def test_stored_reply_with_matching_sha(store, clock):
+    """Test an entry is returned while its SHA matches, however old it is."""
+    store.put("file:o/r/README.md", {"text": "hi"}, sha="abc")
+    clock[0] += 10_000
+
+    assert store.get("file:o/r/README.md", "abc") == {"text": "hi"}
+
+
+def test_stored_reply_with_changed_sha(store):
+    """Test an entry is not returned once its file's SHA has changed."""
+    store.put("file:o/r/README.md", {"text": "hi"}, sha="abc")
+
+    assert store.get("file:o/r/README.md", "def") is None
+
+
+def test_stored_reply_expires_after_ttl(store, clock):
+    """Test an entry looked up without a SHA is only used within the TTL."""
+    store.put("tools", [{"name": "get_file_contents"}])
+
+    clock[0] += 599
+    assert store.get("tools") == [{"name": "get_file_contents"}]
+    clock[0] += 1
+    assert store.get("tools") is None
+
+
+def test_stored_replies_round_trip(store, tmp_path):
+    """Test saved entries are read back by a new StoredReplies."""
+    store.put("tools", [{"name": "search_repositories"}])
+    store.save()
+
+    reloaded = gh.StoredReplies(tmp_path / "replies.json")
+    assert reloaded.get("tools") == [{"name": "search_repositories"}]
+
+
+def test_save_prunes_expired_entries(store, clock, tmp_path):
+    """Test save drops entries that can no longer be used."""
+    store.put("tools", [])
+    store.put("file:o/r/a.md", {"text": "a"}, sha="abc")
+    store.save()
+
+    clock[0] += 600
+    store.save()
+    saved = json.loads((tmp_path / "replies.json").read_text(encoding="utf-8"))
+    assert list(saved) == ["file:o/r/a.md"]
+
+    clock[0] += gh._STORED_MAX_AGE
+    store.save()
+    saved = json.loads((tmp_path / "replies.json").read_text(encoding="utf-8"))
+    assert saved == {}